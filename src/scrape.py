@@ -3,26 +3,147 @@ import pandas as pd
 import re
 import numpy as np
 import os
+import pathlib
 import logging
+import multiprocessing
+import threading
 import requests
+import requests_cache
 import fitz 
+import pyarrow as pa
+import soupsieve as sv
+from pyarrow import csv as pacsv
+from pyarrow import parquet as pq
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from bs4 import BeautifulSoup
 from io import BytesIO
 from openpyxl import load_workbook
+from openpyxl.utils import column_index_from_string
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+DATA_DIR = pathlib.Path(__file__).resolve().parent.parent / 'data'
+RAW_DIR = DATA_DIR / 'raw'
+SCRAPED_DIR = DATA_DIR / 'scraped'
+CACHE_DIR = DATA_DIR / 'cache'
+
+_MAX_HOUR_RE = re.compile(r"Maximum Hour\s*\n*\s*(\d{2}:\d{2} - \d{2}:\d{2})")
+_MAX_HOUR_SPLIT_RE = re.compile(r"Maximum Hour")
+_BIKES_PEDS_RE = re.compile(r"(Bikes|Peds|PEDs)\s*(\d+)")
+_DATE_RE = re.compile(r"\b\w+,\s+\w+\s+\d{1,2},\s+\d{4}\b")
+_WEATHER_RE = re.compile(r"Weather:\s+(\w+)")
+_PAREN_RE = re.compile(r"\((.*?)\)")
+_VEH_VOL_RES = (
+    re.compile(r"PEDs\s+\d+((?:\s+\d+)*).*?Bikes", re.DOTALL),
+    re.compile(r"Peds\s+\d+((?:\s+\d+)*)\s+Peds", re.DOTALL),
+    re.compile(r"Peds\s+\d+.*?Bikes\s+\d+((?:\s+\d+)*)\s+PEDs", re.DOTALL),
+)
+_DIGITS_RE = re.compile(r'\d+')
+_GEOM_RE = re.compile(r'(-?\d+\.\d+),\s*(-?\d+\.\d+)')
+_ATTACHMENT_LINK_RE = re.compile(r'<a[^>]*href=["\']([^"\']+)["\'][^>]*>([^<]*\.(xlsx|pdf)[^<]*)</a>', re.IGNORECASE)
+_PERIOD_BINS = [(6, 8, 'AM'), (9, 15, 'MD'), (16, 19, 'PM')]
+_HOUR_TO_TAG = [next((tag for lo, hi, tag in _PERIOD_BINS if lo <= hour <= hi), None) for hour in range(24)]
+_XLSX_KEY_TO_TAG = {32: 'AM', 62: 'MD', 92: 'PM'}
+_XLSX_MIN_ROW, _XLSX_MAX_ROW = 8, 119
+_XLSX_COLUMNS = {
+    column: column_index_from_string(column) - 1
+    for column in ('A', 'B', 'C', 'L', 'M', 'N', 'P', 'Q', 'V', 'Z', 'AA', 'AB')
+    }
+_OLD_TABLE_KEYS = range(2, 5)
+_SEL_DATE = sv.compile("th[valign='TOP']:nth-of-type(3) p")
+_SEL_WEATHER = sv.compile("th:nth-of-type(13) p")
+_SEL_TYPE = sv.compile("th:nth-of-type(8) p")
+_SEL_BIKES_CELLS = sv.compile("tr:-soup-contains('Bikes') th.s:-soup-contains('Bikes')")
+_SEL_PEDS_CELLS = sv.compile("tr:-soup-contains('Peds') th.s:-soup-contains('Peds')")
+_SEL_EAST_VEH = sv.compile("tr:-soup-contains('Peds') th[align='LEFT'] th:nth-of-type(2) th.s:not(:-soup-contains('Peds')):not(:-soup-contains('Bikes'))")
+_SEL_SOUTH_BIKES = sv.compile("tr:nth-of-type(5):-soup-contains('Bikes')")
+_SEL_SOUTH_PEDS = sv.compile("tr:nth-of-type(4) th.s:-soup-contains('PEDs')")
+_SEL_WEST_VEH = sv.compile("tr:-soup-contains('Peds') th[align='RIGHT'] th:nth-of-type(3) th.s:not(:-soup-contains('Peds')):not(:-soup-contains('Bikes'))")
+_SEL_PEAK_HOUR = {key: sv.compile(f"table:nth-of-type({key}) [valign='MIDDLE'] p.p8") for key in _OLD_TABLE_KEYS}
+_SEL_NORTH_BIKES = {
+    key: sv.compile(f"table:nth-of-type({key}) [valign='BOTTOM'] tr:-soup-contains('Bikes') tr:nth-of-type(1)")
+    for key in _OLD_TABLE_KEYS
+    }
+_SEL_NORTH_PEDS = {key: sv.compile(f"table:nth-of-type({key}) table:nth-of-type(1) th:-soup-contains('PEDs')") for key in _OLD_TABLE_KEYS}
+_SEL_NORTH_VEH = {key: sv.compile(f"table:nth-of-type({key}) table:nth-of-type(1) th.s") for key in _OLD_TABLE_KEYS}
+_SEL_SOUTH_VEH = {key: sv.compile(f"tr:nth-of-type({5*key-6}) th.s:not(:-soup-contains('PEDs'))") for key in _OLD_TABLE_KEYS}
+_DIRS = ('north', 'east', 'south', 'west')
+_KINDS = ('bikes', 'peds', 'veh')
+_OUT_KEYS = {
+    tag: [f'{tag}_peak_hour'] + [f'{tag}_{d}_{k}_vol' for d in _DIRS for k in _KINDS]
+    for tag in ('AM', 'MD', 'PM')
+    }
+
+
+def _classify_hour(hour):
+    return _HOUR_TO_TAG[hour] if 0 <= hour < 24 else None
+
+
+def _extract_coordinates(geom):
+    # Repeat surveys of an intersection share one geometry, so each distinct value is parsed once.
+    unique_geom = geom.drop_duplicates()
+    parsed = unique_geom.str.extract(_GEOM_RE).astype('float32')
+    parsed.columns = ['longitude', 'latitude']
+    parsed.index = unique_geom.values
+    coordinates = parsed.reindex(geom.values)
+    coordinates.index = geom.index
+    return coordinates
+
+
+def _normalize_dtypes(df):
+    dtypes = {}
+    for column in df.columns:
+        if column.endswith('_vol'):
+            numeric = pd.to_numeric(df[column], errors='coerce')
+            # Only columns holding a sentinel such as 'manual_check' stay as text.
+            if numeric.notna().sum() == df[column].notna().sum():
+                df = df.assign(**{column: numeric})
+        elif column.endswith(('_available', '_scraped')) and df[column].dtype == object:
+            dtypes[column] = 'boolean'
+    df = df.astype(dtypes)
+    object_columns = df.select_dtypes(include='object').columns
+    return df.astype({column: 'string' for column in object_columns})
+
+
+def _to_arrow_table(df):
+    return pa.Table.from_pandas(_normalize_dtypes(df), preserve_index=False)
+
+
+def _write_csv(df, path):
+    pacsv.write_csv(_to_arrow_table(df), path)
+
+
+def _write_parquet(df, path):
+    pq.write_table(_to_arrow_table(df), path, compression='snappy')
+
+
+def _decide_east_west(counts):
+    if len(counts) > 4 or (len(counts) == 4 and counts[0] == counts[1] and counts[2] == counts[3]):
+        return counts[-1], counts[0]
+    elif len(counts) in (3, 4):
+        decision = max(counts)
+        return (decision if decision == counts[-1] else None,
+                decision if decision == counts[0] else None)
+    elif len(counts) == 2:
+        return 'manual_check', 'manual_check'
+    return None, None
+
 
 class WebScraper:
     """
     A base class for web scraping that manages session creation and applies filters for data collection.
 
     Attributes:
-        session (requests.Session): A session for making HTTP requests.
+        session (requests.Session): A pooled session for making HTTP requests, retrying transient failures.
         rest (int): Default time to wait for page elements to load.
+        max_workers (int): Number of threads used to issue HTTP requests concurrently.
+        timeout (int): Seconds to wait on a report download before giving up.
+        max_download_size (int): Largest report, in bytes, that will be downloaded and parsed.
         filter_options (dict): Specifies the periods in a list for which to collect data ['AM', 'PM', 'MD'].
         By default all three periods will be scraped. 
 
@@ -37,7 +158,18 @@ class WebScraper:
             period_filters (dict, optional): Filters for data collection periods. Defaults to None.
         """
         self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+            )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
         self.rest = 10
+        self.max_workers = 16
+        self.timeout = 30
+        self.max_download_size = 50 * 1024 * 1024
         self.filter_options = {
             'AM': True,
             'PM': True,
@@ -56,6 +188,31 @@ class WebScraper:
         self.collect_am = self.filter_options.get('AM')
         self.collect_pm = self.filter_options.get('PM')
         self.collect_md = self.filter_options.get('MD')
+
+    def _download(self, url):
+        with self.session.get(url, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            content_length = int(response.headers.get('Content-Length', 0))
+            if content_length > self.max_download_size:
+                raise ValueError(f'report of {content_length} bytes exceeds the {self.max_download_size} byte limit')
+            return response.content
+
+    def _classify_periods(self, tagged_keys):
+        control_dict = {
+            'AM':{'check':None,'table_key':None},
+            'MD':{'check':None,'table_key':None},
+            'PM':{'check':None,'table_key':None}
+            }
+        available = {'AM': False, 'MD': False, 'PM': False}
+        for table_key, tag in tagged_keys:
+            if tag:
+                control_dict[tag]['table_key'] = table_key
+                available[tag] = True
+
+        control_dict['AM']['check'] = self.collect_am and available['AM']
+        control_dict['MD']['check'] = self.collect_md and available['MD']
+        control_dict['PM']['check'] = self.collect_pm and available['PM']
+        return control_dict, available
         
 class OldTMCScraper(WebScraper):
     """
@@ -65,6 +222,7 @@ class OldTMCScraper(WebScraper):
         __init__(self, raw_directory, period_filters=None): Initializes the scraper with a directory and optional filters.
         scrape_sub_urls(self): Expands and scrapes sub URLs from the raw data files.
         scrape_tmc_counts(self, sub_urls_df): Scrapes TMC data from expanded sub URLs.
+        close(self): Shuts down the headless Chrome drivers. Also called when used as a context manager.
     """
     def __init__(self, raw_directory, period_filters = None):
         """
@@ -79,7 +237,45 @@ class OldTMCScraper(WebScraper):
         self.raw_df = self._load_csv()        
         self.options = Options()
         self.options.add_argument('--headless')
-        self.driver = webdriver.Chrome(options=self.options)
+        self.options.add_argument('--blink-settings=imagesEnabled=false')
+        self.options.add_argument('--disable-gpu')
+        self.options.add_argument('--disable-dev-shm-usage')
+        self.browser_workers = 4
+        self.parse_workers = os.cpu_count()
+        self._local = threading.local()
+        self._drivers = []
+        self._drivers_lock = threading.Lock()
+
+    def __getstate__(self):
+        # Parse workers only need the period filters; the session and browsers stay in this process.
+        state = self.__dict__.copy()
+        for key in ('session', 'options', 'raw_df', '_local', '_drivers', '_drivers_lock'):
+            state.pop(key, None)
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Quits every headless Chrome driver started to expand the sub URLs.
+        """
+        with self._drivers_lock:
+            for driver in self._drivers:
+                driver.quit()
+            self._drivers.clear()
+
+    def _get_driver(self):
+        driver = getattr(self._local, 'driver', None)
+        if driver is None:
+            driver = webdriver.Chrome(options=self.options)
+            self._local.driver = driver
+            with self._drivers_lock:
+                self._drivers.append(driver)
+        return driver
         
     def _load_csv(self):
         return pd.read_csv(self.raw,sep=';')
@@ -92,8 +288,12 @@ class OldTMCScraper(WebScraper):
             DataFrame: A pandas DataFrame containing expanded sub URLs.
         """
         urls = self.raw_df["URL"] 
-        expanded_urls= urls.apply(lambda row: self._explode_url(row))
-        expanded_urls.rename('Sub_URL',inplace=True)
+        try:
+            with ThreadPoolExecutor(max_workers=self.browser_workers) as executor:
+                expanded = list(executor.map(self._explode_url, urls.tolist()))
+        finally:
+            self.close()
+        expanded_urls = pd.Series(expanded, index=urls.index, name='Sub_URL')
         return pd.concat([self.raw_df,expanded_urls],axis =1).explode\
                         ('Sub_URL',ignore_index=True)
     
@@ -101,24 +301,29 @@ class OldTMCScraper(WebScraper):
         
         if row:
             sub_urls = []
-            self.driver.get('about:blank') 
-            self.driver.get(row)
+            driver = self._get_driver()
+            # The raw URLs only differ by their #fragment, so without leaving the page first
+            # get(row) is a same-document navigation and the previous table would be read.
+            driver.get('about:blank') 
+            driver.get(row)
 
             try:
-                coordinate_element = WebDriverWait(self.driver, self.rest).until(
+                coordinate_element = WebDriverWait(driver, self.rest).until(
                     EC.presence_of_element_located((By.CLASS_NAME, 'sorting_1'))
                 )
                 coordinate = coordinate_element.text.strip()
 
                 links_selector = f'td a[target^="0{coordinate}"]'
 
-                links_elements = WebDriverWait(self.driver, self.rest).until(
+                links_elements = WebDriverWait(driver, self.rest).until(
                     EC.presence_of_all_elements_located((By.CSS_SELECTOR, links_selector))
                 )
 
-                for link in links_elements:
-                    href = link.get_attribute('href')
-                    sub_urls.append(href)
+                # The report table is rendered client-side, so the links have to come from the
+                # browser; read all hrefs in one script call rather than one RPC per element.
+                sub_urls = driver.execute_script(
+                    "return arguments[0].map(function (link) { return link.href; });", links_elements
+                )
 
             except Exception as e:
                 print("An error occurred: ", e)
@@ -133,80 +338,73 @@ class OldTMCScraper(WebScraper):
             sub_urls_df (DataFrame): A DataFrame containing sub URLs of .htm files.
 
         Returns:
-            DataFrame: A normalized DataFrame with scraped TMC data.
+            DataFrame: A DataFrame with scraped TMC data, one row per input row.
         """
-        tmc_urls = sub_urls_df['Sub_URL'] 
-        tmc_data = tmc_urls.apply(lambda row: self._scrape_tmc(row))
-        return pd.json_normalize(tmc_data)
-
-    def _scrape_tmc(self, row):
+        tmc_urls = sub_urls_df['Sub_URL'].tolist()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pages = list(executor.map(self._fetch_page, tmc_urls))
+        # Parsing is CPU-bound Python, so it runs in processes; spawn because this process is threaded.
+        with ProcessPoolExecutor(max_workers=self.parse_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            tmc_data = list(executor.map(self._parse_tmc, tmc_urls, pages, chunksize=32))
+        tmc_df = pd.DataFrame.from_records([tmc or {} for tmc in tmc_data], index=sub_urls_df.index)
+        if 'date' in tmc_df:
+            tmc_df['date'] = pd.to_datetime(tmc_df['date'], errors='coerce')
+        return tmc_df
+
+    def _fetch_page(self, row):
         if pd.isna(row):
             return None
 
         try:
-            response = self.session.get(row)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            tmc = {}
-            available_am = False
-            available_md = False
-            available_pm = False
-            control_dict = {
-                'AM':{'check':None,'table_key':None},
-                'MD':{'check':None,'table_key':None},
-                'PM':{'check':None,'table_key':None}
-                }
-            for i in range(2,5):
-                period = self._get_peak_hour(soup,key=i)
-                if period:
-                    peak_start_hr = int(period[:2])
-
-                    if 6 <= peak_start_hr <= 8:
-                        control_dict['AM']['table_key'] = i
-                        available_am = True
-                    elif 9 <= peak_start_hr <= 15:
-                        control_dict['MD']['table_key'] = i
-                        available_md = True
-                    elif 16 <= peak_start_hr <= 19:
-                        control_dict['PM']['table_key'] = i
-                        available_pm = True
-                    else:
-                        continue
-            
-            control_dict['AM']['check'] = self.collect_am and available_am
-            control_dict['MD']['check'] = self.collect_md and available_md
-            control_dict['PM']['check'] = self.collect_pm and available_pm
+            return self.session.get(row).text
+
+        except Exception as e:
+            logging.error(f'{row} had an error: {e}')
+            return None
+
+    def _parse_tmc(self, row, html):
+        if html is None:
+            return None
+
+        try:
+            soup = BeautifulSoup(html, 'html.parser')
+            peak_hours = {i: self._get_peak_hour(soup,key=i) for i in _OLD_TABLE_KEYS}
+            control_dict, available = self._classify_periods(
+                (i, _classify_hour(int(period[:2]))) for i, period in peak_hours.items() if period
+                )
             
-            tmc.update({
+            tmc = {
                 'date': self._get_date(soup),
                 'weather': self._get_weather(soup),
                 'type': self._get_type(soup),
-                'AM_available': available_am,
+                'AM_available': available['AM'],
                 'AM_scraped': self.collect_am,
-                'MD_available': available_md,
+                'MD_available': available['MD'],
                 'MD_scraped': self.collect_md,                
-                'PM_available': available_pm,
+                'PM_available': available['PM'],
                 'PM_scraped': self.collect_pm
-            })
+            }
                 
-            for key,value in control_dict.items():
+            bikes_cells = _SEL_BIKES_CELLS.select(soup)
+            peds_cells = _SEL_PEDS_CELLS.select(soup)
+            for tag,value in control_dict.items():
                 if value.get('check'):
-                    tag = key
                     position = value.get('table_key')
-                    tmc.update({
-                        f'{tag}_peak_hour': self._get_peak_hour(soup,position),
-                        f'{tag}_north_bikes_vol': self._get_north_bikes_vol(soup,position),
-                        f'{tag}_north_peds_vol': self._get_north_peds_vol(soup,position),
-                        f'{tag}_north_veh_vol': self._get_north_veh_vol(soup,position),
-                        f'{tag}_east_bikes_vol' : self._get_east_bikes_vol(soup,position),
-                        f'{tag}_east_peds_vol' : self._get_east_peds_vol(soup,position),
-                        f'{tag}_east_veh_vol' : self._get_east_veh_vol(soup,position),
-                        f'{tag}_south_bikes_vol' : self._get_south_bikes_vol(soup,position),
-                        f'{tag}_south_peds_vol' : self._get_south_peds_vol(soup,position),
-                        f'{tag}_south_veh_vol' : self._get_south_veh_vol(soup,position),
-                        f'{tag}_west_bikes_vol' : self._get_west_bikes_vol(soup,position),
-                        f'{tag}_west_peds_vol' : self._get_west_peds_vol(soup,position),
-                        f'{tag}_west_veh_vol' : self._get_west_veh_vol(soup,position)
-                    })
+                    tmc.update(zip(_OUT_KEYS[tag], (
+                        peak_hours[position],
+                        self._get_north_bikes_vol(soup,position),
+                        self._get_north_peds_vol(soup,position),
+                        self._get_north_veh_vol(soup,position),
+                        self._get_east_bikes_vol(bikes_cells,position),
+                        self._get_east_peds_vol(peds_cells,position),
+                        self._get_east_veh_vol(soup,position),
+                        self._get_south_bikes_vol(soup,position),
+                        self._get_south_peds_vol(soup,position),
+                        self._get_south_veh_vol(soup,position),
+                        self._get_west_bikes_vol(bikes_cells,position),
+                        self._get_west_peds_vol(peds_cells,position),
+                        self._get_west_veh_vol(soup,position),
+                    )))
             
             return tmc
             
@@ -215,69 +413,65 @@ class OldTMCScraper(WebScraper):
             return None
 
     def _get_date(self, soup):
-        element = soup.select_one("th[valign='TOP']:nth-of-type(3) p")
-        return pd.to_datetime(element.text if element else None)
+        element = _SEL_DATE.select_one(soup)
+        return element.text if element else None
 
     def _get_weather(self, soup):
-        elements = soup.select("th:nth-of-type(13) p")
-        return elements[0].text.split()[-1].lower() if elements else None
+        element = _SEL_WEATHER.select_one(soup)
+        return element.text.split()[-1].lower() if element else None
 
     def _get_type(self, soup):
-        element = soup.select_one("th:nth-of-type(8) p")
+        element = _SEL_TYPE.select_one(soup)
         return element.text if element else None
 
     def _get_peak_hour(self, soup, key):
-        element = soup.select_one(f"table:nth-of-type({key}) [valign='MIDDLE'] p.p8")
+        element = _SEL_PEAK_HOUR[key].select_one(soup)
         return element.text.replace("Maximum Hour ", "") if element else None
 
     def _get_north_bikes_vol(self, soup, key):
-        elements = soup.select(f"table:nth-of-type({key}) [valign='BOTTOM'] tr:-soup-contains('Bikes') tr:nth-of-type(1)")
-        return re.findall(r'\d+', elements[0].text)[0] if elements else None
+        element = _SEL_NORTH_BIKES[key].select_one(soup)
+        return _DIGITS_RE.findall(element.text)[0] if element else None
 
     def _get_north_peds_vol(self, soup, key):
-        elements = soup.select(f"table:nth-of-type({key}) table:nth-of-type(1) th:-soup-contains('PEDs')")
-        return re.findall(r'\d+', elements[0].text)[-1] if elements else None
+        element = _SEL_NORTH_PEDS[key].select_one(soup)
+        return _DIGITS_RE.findall(element.text)[-1] if element else None
 
     def _get_north_veh_vol(self, soup, key):
-        elements = soup.select(f"table:nth-of-type({key}) table:nth-of-type(1) th.s")
-        nums = re.findall(r'\d+', "".join([str(e) for e in elements]))
+        elements = _SEL_NORTH_VEH[key].select(soup)
+        nums = _DIGITS_RE.findall("".join([str(e) for e in elements]))
         return nums[2] if len(nums) > 2 else None
     
-    def _get_east_bikes_vol(self, soup, key):
-        elements = soup.select("tr:-soup-contains('Bikes') th.s:-soup-contains('Bikes')")
-        return re.findall(r'\d+', elements[2*key-3].text)[0] if elements and 0 <= 2*key-3 < len(elements) else None
+    def _get_east_bikes_vol(self, bikes_cells, key):
+        return _DIGITS_RE.findall(bikes_cells[2*key-3].text)[0] if bikes_cells and 0 <= 2*key-3 < len(bikes_cells) else None
     
-    def _get_east_peds_vol(self, soup, key):
-        elements = soup.select("tr:-soup-contains('Peds') th.s:-soup-contains('Peds')")
-        return re.findall(r'\d+', elements[2*key-3].text)[0] if elements and 0 <= 2*key-3 < len(elements) else None
+    def _get_east_peds_vol(self, peds_cells, key):
+        return _DIGITS_RE.findall(peds_cells[2*key-3].text)[0] if peds_cells and 0 <= 2*key-3 < len(peds_cells) else None
 
     def _get_east_veh_vol(self, soup, key):
-        elements = soup.select("tr:-soup-contains('Peds') th[align='LEFT'] th:nth-of-type(2) th.s:not(:-soup-contains('Peds')):not(:-soup-contains('Bikes'))")
-        return re.findall(r'\d+', elements[key-2].text)[0] if elements else None
+        elements = _SEL_EAST_VEH.select(soup)
+        return _DIGITS_RE.findall(elements[key-2].text)[0] if elements else None
     
     def _get_south_bikes_vol(self, soup, key):
-        elements = soup.select("tr:nth-of-type(5):-soup-contains('Bikes')")
-        return re.findall(r'\d+', elements[key-2].text)[0] if elements and 0 <= key-2 < len(elements) else None
+        elements = _SEL_SOUTH_BIKES.select(soup)
+        return _DIGITS_RE.findall(elements[key-2].text)[0] if elements and 0 <= key-2 < len(elements) else None
 
     def _get_south_peds_vol(self, soup, key):
-        elements = soup.select("tr:nth-of-type(4) th.s:-soup-contains('PEDs')")
-        return re.findall(r'\d+', elements[key-2].text)[0] if elements and 0 <= key-2 < len(elements) else None
+        elements = _SEL_SOUTH_PEDS.select(soup)
+        return _DIGITS_RE.findall(elements[key-2].text)[0] if elements and 0 <= key-2 < len(elements) else None
  
     def _get_south_veh_vol(self, soup, key):
-        elements = soup.select(f"tr:nth-of-type({5*key-6}) th.s:not(:-soup-contains('PEDs'))")
-        return re.findall(r'\d+', elements[-1].text)[0] if elements else None
+        elements = _SEL_SOUTH_VEH[key].select(soup)
+        return _DIGITS_RE.findall(elements[-1].text)[0] if elements else None
     
-    def _get_west_bikes_vol(self, soup, key):
-        elements = soup.select("tr:-soup-contains('Bikes') th.s:-soup-contains('Bikes')")
-        return re.findall(r'\d+', elements[2*key-4].text)[0] if elements and 0 <= 2*key-4 < len(elements) else None
+    def _get_west_bikes_vol(self, bikes_cells, key):
+        return _DIGITS_RE.findall(bikes_cells[2*key-4].text)[0] if bikes_cells and 0 <= 2*key-4 < len(bikes_cells) else None
 
-    def _get_west_peds_vol(self, soup, key):
-        elements = soup.select("tr:-soup-contains('Peds') th.s:-soup-contains('Peds')")
-        return re.findall(r'\d+', elements[2*key-4].text)[0] if elements and 0 <= 2*key-4 < len(elements) else None
+    def _get_west_peds_vol(self, peds_cells, key):
+        return _DIGITS_RE.findall(peds_cells[2*key-4].text)[0] if peds_cells and 0 <= 2*key-4 < len(peds_cells) else None
 
     def _get_west_veh_vol(self, soup, key):
-        elements = soup.select("tr:-soup-contains('Peds') th[align='RIGHT'] th:nth-of-type(3) th.s:not(:-soup-contains('Peds')):not(:-soup-contains('Bikes'))")
-        return re.findall(r'\d+', elements[key-2].text)[0] if elements else None
+        elements = _SEL_WEST_VEH.select(soup)
+        return _DIGITS_RE.findall(elements[key-2].text)[0] if elements else None
 
 class RecentTMCScraper(WebScraper):
     """
@@ -299,6 +493,7 @@ class RecentTMCScraper(WebScraper):
         super().__init__(period_filters=period_filters) 
         self.raw = raw_directory
         self.raw_df = self._load_csv()  
+        self.base_url = "https://maps.vancouver.ca"
         self.year_key_dict = {
             '2012' : '16',
             '2013' : '16',
@@ -323,32 +518,28 @@ class RecentTMCScraper(WebScraper):
         Returns:
             DataFrame: A DataFrame with constructed URLs and file types of .pdf or .xlsx.
         """
-        tmc = self.raw_df[["Year","OBJECTID"]].astype(str)
-        constructed_data = tmc.apply(lambda row: self._construct_url(row), axis=1)
-        constructed_urls = constructed_data.apply(lambda x: x[0] if x is not np.nan else np.nan)
-        file_types = constructed_data.apply(lambda x: x[1] if x is not None else np.nan)
-        constructed_urls.rename('Const_URL', inplace=True)
-        file_types.rename('FileType', inplace=True)
-        return pd.concat([self.raw_df, constructed_urls, file_types], axis=1)
+        path_urls = self.base_url + "/server/rest/services/VanMapViewer/Traffic_and_Transportation/MapServer/" \
+                    + self.raw_df["Year"].astype(str).map(self.year_key_dict) + "/" \
+                    + self.raw_df["OBJECTID"].astype(str) + "/attachments/"
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            constructed_data = list(executor.map(self._fetch_attachment, path_urls.tolist()))
+        constructed = pd.DataFrame(constructed_data, columns=['Const_URL', 'FileType'], index=self.raw_df.index)
+        return pd.concat([self.raw_df, constructed], axis=1)
     
-    def _construct_url(self, row):
-        year = row['Year']
-        object_id = row['OBJECTID']
-        base_url = "https://maps.vancouver.ca"
-        path_url = f"/server/rest/services/VanMapViewer/Traffic_and_Transportation/MapServer/{self.year_key_dict.get(year)}/{object_id}/attachments/"
+    def _fetch_attachment(self, url):
+        if pd.isna(url):
+            return np.nan, None
 
-        response = self.session.get(base_url+path_url)
+        response = self.session.get(url)
         response.raise_for_status() 
-        soup_link = BeautifulSoup(response.text, 'html.parser')
-        attachment_link_tag = soup_link.find('a', text=lambda x: '.xlsx' in x.lower() or '.pdf' in x.lower())
+        attachment_link = _ATTACHMENT_LINK_RE.search(response.text)
 
-        if attachment_link_tag:
-            attachment_url = attachment_link_tag['href']
-            full_url = base_url + attachment_url
-            file_type = 'xlsx' if '.xlsx' in attachment_link_tag.text else 'pdf'
+        if attachment_link:
+            full_url = self.base_url + attachment_link.group(1)
+            file_type = attachment_link.group(3).lower()
             return full_url, file_type
         else:
-            print(f'The tmc link on {year} for {object_id} was not found')
+            print(f'The tmc link at {url} was not found')
             return np.nan, None
 
     def scrape_tmc_counts(self,sub_urls_df):
@@ -359,101 +550,94 @@ class RecentTMCScraper(WebScraper):
             sub_urls_df (DataFrame): A DataFrame containing URLs and file types of .pdf or .xlsx.
 
         Returns:
-            DataFrame: A normalized DataFrame with scraped TMC data.
+            DataFrame: A DataFrame with scraped TMC data, one row per input row.
         """
-        tmc_urls = sub_urls_df[['Const_URL','FileType']]
-        tmc_data = tmc_urls.apply(lambda row: self._scrape_tmc(row),axis=1)
-        return pd.json_normalize(tmc_data)
+        tmc_urls = sub_urls_df[['Const_URL','FileType']].to_dict('records')
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            reports = list(executor.map(self._fetch_report, tmc_urls))
+        # PyMuPDF is not thread-safe, so the downloaded reports are parsed here one at a time.
+        tmc_data = [self._scrape_tmc(row, data) for row, data in zip(tmc_urls, reports)]
+        tmc_df = pd.DataFrame.from_records([tmc or {} for tmc in tmc_data], index=sub_urls_df.index)
+        if 'date' in tmc_df:
+            tmc_df['date'] = pd.to_datetime(tmc_df['date'], errors='coerce')
+        return tmc_df
+
+    def _fetch_report(self, row):
+        if pd.isna(row['Const_URL']) or row['FileType'] not in ('pdf', 'xlsx'):
+            return None
+
+        try:
+            return self._download(row['Const_URL'])
 
-    def _scrape_tmc(self, row):
-        if pd.isna(row['Const_URL']):
+        except Exception as e:
+            logging.error(f"{row['Const_URL']} had an error: {e}")
+            return None
+
+    def _scrape_tmc(self, row, data):
+        if data is None:
             return None
         elif row['FileType'] == 'pdf':
-            return self._read_pdf(row['Const_URL'])
+            return self._read_pdf(row['Const_URL'], data)
         elif row['FileType'] == 'xlsx':
-            return self._read_xlsx(row['Const_URL'])
+            return self._read_xlsx(row['Const_URL'], data)
         else:
             return None
         
-    def _read_xlsx(self,url):
+    def _read_xlsx(self,url,data):
       
+        wb = None
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            file_content = BytesIO(response.content)
-            wb = load_workbook(filename=file_content)
+            wb = load_workbook(filename=BytesIO(data), read_only=True, data_only=True)
             ws = wb['Summary']
+            grid = list(ws.iter_rows(
+                min_row=_XLSX_MIN_ROW, max_row=_XLSX_MAX_ROW, max_col=max(_XLSX_COLUMNS.values()) + 1, values_only=True
+                ))
 
-            tmc = {}
+            tagged_keys = []
+            for i, tag in _XLSX_KEY_TO_TAG.items():
 
-            available_am = False
-            available_md = False
-            available_pm = False
-            
-            control_dict = {
-                'AM':{'check':None,'table_key':None},
-                'MD':{'check':None,'table_key':None},
-                'PM':{'check':None,'table_key':None}
-                }
-
-            for i in [32,62,92]:
-
-                period = self._xlsx_get_peak_hour(ws,key=i)
+                period = self._xlsx_get_peak_hour(grid,key=i)
 
                 if period:
                     
                     peak_start = period[:6]
                     peak_end= period[-5:]
 
-                    period_check = (pd.to_datetime(peak_end) - pd.to_datetime(peak_start)).total_seconds() == 3600
-
-                    if  i==32 and period_check:
-                        control_dict['AM']['table_key'] = i
-                        available_am = True
-                    elif i==62 and period_check:
-                        control_dict['MD']['table_key'] = i
-                        available_md = True
-                    elif i==92 and period_check:
-                        control_dict['PM']['table_key'] = i
-                        available_pm = True
-                    else:
-                        continue
-            
-            control_dict['AM']['check'] = self.collect_am and available_am
-            control_dict['MD']['check'] = self.collect_md and available_md
-            control_dict['PM']['check'] = self.collect_pm and available_pm
-
-            tmc.update({
-                'date': self._xlsx_get_date(ws),
-                'weather': self._xlsx_get_weather(ws),
-                'type': self._xlsx_get_type(ws),
-                'AM_available': available_am,
+                    if (pd.to_datetime(peak_end) - pd.to_datetime(peak_start)).total_seconds() == 3600:
+                        tagged_keys.append((i, tag))
+
+            control_dict, available = self._classify_periods(tagged_keys)
+
+            tmc = {
+                'date': self._xlsx_get_date(grid),
+                'weather': self._xlsx_get_weather(grid),
+                'type': self._xlsx_get_type(grid),
+                'AM_available': available['AM'],
                 'AM_scraped': self.collect_am,
-                'MD_available': available_md,
+                'MD_available': available['MD'],
                 'MD_scraped': self.collect_md,                
-                'PM_available': available_pm,
+                'PM_available': available['PM'],
                 'PM_scraped': self.collect_pm
-            })
+            }
                 
-            for key,value in control_dict.items():
+            for tag,value in control_dict.items():
                 if value.get('check'):
-                    tag = key
                     position = value.get('table_key')
-                    tmc.update({
-                        f'{tag}_peak_hour': self._xlsx_get_peak_hour(ws,position),
-                        f'{tag}_north_bikes_vol': self._xlsx_get_north_bikes_vol(ws,position),
-                        f'{tag}_north_peds_vol': self._xlsx_get_north_peds_vol(ws,position),
-                        f'{tag}_north_veh_vol': self._xlsx_get_north_veh_vol(ws,position),
-                        f'{tag}_east_bikes_vol' : self._xlsx_get_east_bikes_vol(ws,position),
-                        f'{tag}_east_peds_vol' : self._xlsx_get_east_peds_vol(ws,position),
-                        f'{tag}_east_veh_vol' : self._xlsx_get_east_veh_vol(ws,position),
-                        f'{tag}_south_bikes_vol' : self._xlsx_get_south_bikes_vol(ws,position),
-                        f'{tag}_south_peds_vol' : self._xlsx_get_south_peds_vol(ws,position),
-                        f'{tag}_south_veh_vol' : self._xlsx_get_south_veh_vol(ws,position),
-                        f'{tag}_west_bikes_vol' : self._xlsx_get_west_bikes_vol(ws,position),
-                        f'{tag}_west_peds_vol' : self._xlsx_get_west_peds_vol(ws,position),
-                        f'{tag}_west_veh_vol' : self._xlsx_get_west_veh_vol(ws,position)
-                    })
+                    tmc.update(zip(_OUT_KEYS[tag], (
+                        self._xlsx_get_peak_hour(grid,position),
+                        self._xlsx_get_north_bikes_vol(grid,position),
+                        self._xlsx_get_north_peds_vol(grid,position),
+                        self._xlsx_get_north_veh_vol(grid,position),
+                        self._xlsx_get_east_bikes_vol(grid,position),
+                        self._xlsx_get_east_peds_vol(grid,position),
+                        self._xlsx_get_east_veh_vol(grid,position),
+                        self._xlsx_get_south_bikes_vol(grid,position),
+                        self._xlsx_get_south_peds_vol(grid,position),
+                        self._xlsx_get_south_veh_vol(grid,position),
+                        self._xlsx_get_west_bikes_vol(grid,position),
+                        self._xlsx_get_west_peds_vol(grid,position),
+                        self._xlsx_get_west_veh_vol(grid,position),
+                    )))
             
             return tmc
         
@@ -461,145 +645,127 @@ class RecentTMCScraper(WebScraper):
             logging.error(f'{url} had an error: {e}')
             return None
 
-    def _xlsx_get_date(self, ws):
-        element = ws['N15'].value
+        finally:
+            if wb is not None:
+                wb.close()
+
+    def _xlsx_value(self, grid, column, row):
+        row_values = grid[row - _XLSX_MIN_ROW] if 0 <= row - _XLSX_MIN_ROW < len(grid) else ()
+        index = _XLSX_COLUMNS[column]
+        return row_values[index] if index < len(row_values) else None
+
+    def _xlsx_get_date(self, grid):
+        element = self._xlsx_value(grid, 'N', 15)
         return element if element else None
 
-    def _xlsx_get_weather(self, ws):
-        element = ws['V8'].value
+    def _xlsx_get_weather(self, grid):
+        element = self._xlsx_value(grid, 'V', 8)
         return element.lower() if element else None
 
-    def _xlsx_get_type(self, ws):
+    def _xlsx_get_type(self, grid):
         return None
     
-    def _xlsx_get_peak_hour(self, ws, key):
-        element_1 = ws[f'N{key+15}'].value
-        element_2 = ws[f'P{key+15}'].value
+    def _xlsx_get_peak_hour(self, grid, key):
+        element_1 = self._xlsx_value(grid, 'N', key+15)
+        element_2 = self._xlsx_value(grid, 'P', key+15)
         return str(element_1)[:-3].rjust(5, '0') + " - " + str(element_2)[:-3].rjust(5, '0') if element_1 and element_2 else None
 
-    def _xlsx_get_north_bikes_vol(self, ws, key):
-        element = ws[f'M{key+1}'].value
+    def _xlsx_get_north_bikes_vol(self, grid, key):
+        element = self._xlsx_value(grid, 'M', key+1)
         return element if element else None
 
-    def _xlsx_get_north_peds_vol(self, ws, key):
-        element = ws[f'L{key+2}'].value
+    def _xlsx_get_north_peds_vol(self, grid, key):
+        element = self._xlsx_value(grid, 'L', key+2)
         return element if element else None
 
-    def _xlsx_get_north_veh_vol(self, ws, key):
-        element = ws[f'M{key}'].value
+    def _xlsx_get_north_veh_vol(self, grid, key):
+        element = self._xlsx_value(grid, 'M', key)
         return element if element else None
     
-    def _xlsx_get_east_bikes_vol(self, ws, key):
-        element = ws[f'AA{key+12}'].value
+    def _xlsx_get_east_bikes_vol(self, grid, key):
+        element = self._xlsx_value(grid, 'AA', key+12)
         return element if element else None
     
-    def _xlsx_get_east_peds_vol(self, ws, key):
-        element = ws[f'Z{key+11}'].value
+    def _xlsx_get_east_peds_vol(self, grid, key):
+        element = self._xlsx_value(grid, 'Z', key+11)
         return element if element else None
 
-    def _xlsx_get_east_veh_vol(self, ws, key):
-        element = ws[f'AB{key+12}'].value
+    def _xlsx_get_east_veh_vol(self, grid, key):
+        element = self._xlsx_value(grid, 'AB', key+12)
         return element if element else None
     
-    def _xlsx_get_south_bikes_vol(self, ws, key):
-        element = ws[f'P{key+26}'].value
+    def _xlsx_get_south_bikes_vol(self, grid, key):
+        element = self._xlsx_value(grid, 'P', key+26)
         return element if element else None
 
-    def _xlsx_get_south_peds_vol(self, ws, key):
-        element = ws[f'Q{key+25}'].value
+    def _xlsx_get_south_peds_vol(self, grid, key):
+        element = self._xlsx_value(grid, 'Q', key+25)
         return element if element else None
  
-    def _xlsx_get_south_veh_vol(self, ws, key):
-        element = ws[f'P{key+27}'].value
+    def _xlsx_get_south_veh_vol(self, grid, key):
+        element = self._xlsx_value(grid, 'P', key+27)
         return element if element else None
     
-    def _xlsx_get_west_bikes_vol(self, ws, key):
-        element = ws[f'B{key+15}'].value
+    def _xlsx_get_west_bikes_vol(self, grid, key):
+        element = self._xlsx_value(grid, 'B', key+15)
         return element if element else None
 
-    def _xlsx_get_west_peds_vol(self, ws, key):
-        element = ws[f'C{key+16}'].value
+    def _xlsx_get_west_peds_vol(self, grid, key):
+        element = self._xlsx_value(grid, 'C', key+16)
         return element if element else None
 
-    def _xlsx_get_west_veh_vol(self, ws, key):
-        element = ws[f'A{key+15}'].value
+    def _xlsx_get_west_veh_vol(self, grid, key):
+        element = self._xlsx_value(grid, 'A', key+15)
         return element if element else None
     
-    def _read_pdf(self,url):
+    def _read_pdf(self,url,data):
 
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            pdf_stream = BytesIO(response.content)
-            doc = fitz.open("pdf", pdf_stream.getvalue())
-            text = doc[0].get_text()
-            
-            tmc = {}
-            
-            available_am = False
-            available_md = False
-            available_pm = False
+            with fitz.open(stream=data, filetype="pdf") as doc:
+                text = doc.load_page(0).get_text("text")
             
-            control_dict = {
-                'AM':{'check':None,'table_key':None},
-                'MD':{'check':None,'table_key':None},
-                'PM':{'check':None,'table_key':None}
-                }
-            periods = re.findall(r"Maximum Hour\s*\n*\s*(\d{2}:\d{2} - \d{2}:\d{2})", text)
-            for i in range(0,len(periods)):
-                period = periods[i]
-                if period:
-                    peak_start_hr = int(period[:2])
-
-                    if 6 <= peak_start_hr <= 8:
-                        control_dict['AM']['table_key'] = i
-                        available_am = True
-                    elif 9 <= peak_start_hr <= 15:
-                        control_dict['MD']['table_key'] = i
-                        available_md = True
-                    elif 16 <= peak_start_hr <= 19:
-                        control_dict['PM']['table_key'] = i
-                        available_pm = True
-                    else:
-                        continue
-            
-            control_dict['AM']['check'] = self.collect_am and available_am
-            control_dict['MD']['check'] = self.collect_md and available_md
-            control_dict['PM']['check'] = self.collect_pm and available_pm
+            periods = _MAX_HOUR_RE.findall(text)
+            sections = _MAX_HOUR_SPLIT_RE.split(text)[1:]
+            peds_and_bikes_by_section = [
+                [number for keyword, number in _BIKES_PEDS_RE.findall(section)][:8]
+                for section in sections
+                ]
+            control_dict, available = self._classify_periods(
+                (i, _classify_hour(int(period[:2]))) for i, period in enumerate(periods) if period
+                )
             
-            tmc.update({
+            tmc = {
                 'date': self._get_date(text),
                 'weather': self._get_weather(text),
                 'type': self._get_type(text),
-                'AM_available': available_am,
+                'AM_available': available['AM'],
                 'AM_scraped': self.collect_am,
-                'MD_available': available_md,
+                'MD_available': available['MD'],
                 'MD_scraped': self.collect_md,                
-                'PM_available': available_pm,
+                'PM_available': available['PM'],
                 'PM_scraped': self.collect_pm
-            })
+            }
                 
-            for key,value in control_dict.items():
+            for tag,value in control_dict.items():
                 if value.get('check'):
-                    tag = key
                     position = value.get('table_key')
-                    peds_and_bikes_vol = self._get_peds_and_bikes_vol(text,position)
-                    veh_vol = self._get_veh_vol(text,position)
-                    tmc.update({
-                        f'{tag}_peak_hour': self._get_peak_hour(text,position),
-                        f'{tag}_north_bikes_vol': peds_and_bikes_vol[0] if len(peds_and_bikes_vol) > 0 else None,
-                        f'{tag}_north_peds_vol': peds_and_bikes_vol[1] if len(peds_and_bikes_vol) > 1 else None,
-                        f'{tag}_north_veh_vol': veh_vol.get('north', None),
-                        f'{tag}_east_bikes_vol' : peds_and_bikes_vol[5] if len(peds_and_bikes_vol) > 5 else None,
-                        f'{tag}_east_peds_vol' : peds_and_bikes_vol[4] if len(peds_and_bikes_vol) > 4 else None,
-                        f'{tag}_east_veh_vol' : veh_vol.get('east', None),
-                        f'{tag}_south_bikes_vol' : peds_and_bikes_vol[7] if len(peds_and_bikes_vol) > 7 else None,
-                        f'{tag}_south_peds_vol' : peds_and_bikes_vol[6] if len(peds_and_bikes_vol) > 6 else None,
-                        f'{tag}_south_veh_vol' : veh_vol.get('south', None),
-                        f'{tag}_west_bikes_vol' : peds_and_bikes_vol[2] if len(peds_and_bikes_vol) > 2 else None,
-                        f'{tag}_west_peds_vol' : peds_and_bikes_vol[3] if len(peds_and_bikes_vol) > 3 else None,
-                        f'{tag}_west_veh_vol' : veh_vol.get('west', None)
-                    })
+                    peds_and_bikes_vol = self._get_peds_and_bikes_vol(peds_and_bikes_by_section,position)
+                    veh_vol = self._get_veh_vol(sections,position)
+                    tmc.update(zip(_OUT_KEYS[tag], (
+                        self._get_peak_hour(periods,position),
+                        peds_and_bikes_vol[0] if len(peds_and_bikes_vol) > 0 else None,
+                        peds_and_bikes_vol[1] if len(peds_and_bikes_vol) > 1 else None,
+                        veh_vol.get('north', None),
+                        peds_and_bikes_vol[5] if len(peds_and_bikes_vol) > 5 else None,
+                        peds_and_bikes_vol[4] if len(peds_and_bikes_vol) > 4 else None,
+                        veh_vol.get('east', None),
+                        peds_and_bikes_vol[7] if len(peds_and_bikes_vol) > 7 else None,
+                        peds_and_bikes_vol[6] if len(peds_and_bikes_vol) > 6 else None,
+                        veh_vol.get('south', None),
+                        peds_and_bikes_vol[2] if len(peds_and_bikes_vol) > 2 else None,
+                        peds_and_bikes_vol[3] if len(peds_and_bikes_vol) > 3 else None,
+                        veh_vol.get('west', None),
+                    )))
             
             return tmc
             
@@ -608,45 +774,29 @@ class RecentTMCScraper(WebScraper):
             return None
 
     def _get_date(self, text):
-        elements = re.findall(r"\b\w+,\s+\w+\s+\d{1,2},\s+\d{4}\b", text)
-        return pd.to_datetime(elements[0] if elements else None)
+        element = _DATE_RE.search(text)
+        return element.group() if element else None
 
     def _get_weather(self, text):
-        elements = re.findall(r"Weather:\s+(\w+)", text)
-        return elements[0].strip().lower() if elements else None
+        element = _WEATHER_RE.search(text)
+        return element.group(1).strip().lower() if element else None
 
     def _get_type(self, text):
-        element = re.findall(r"\((.*?)\)", text)
-        return element[0] if element else None
-
-    def _get_peak_hour(self, text, key):
-        elements = re.findall(r"Maximum Hour\s*\n*\s*(\d{2}:\d{2} - \d{2}:\d{2})", text)
-        return elements[key] if elements else None
-
-    def _get_peds_and_bikes_vol(self, text, key):
-        sections = re.split(r"Maximum Hour", text)[1:] 
-        elements = []
-        for section in sections:
-            matches = re.findall(r"(Bikes|Peds|PEDs)\s*(\d+)", section)
-            numbers = [number for keyword, number in matches]
-            elements.append(numbers[:8])
-            
-        return elements[key] if elements else None
+        element = _PAREN_RE.search(text)
+        return element.group(1) if element else None
 
-    def _get_veh_vol(self, text, key):
-        
-        sections = re.split(r"Maximum Hour", text, flags=re.DOTALL)
-        patterns = [
-            r"PEDs\s+\d+((?:\s+\d+)*).*?Bikes",  
-            r"Peds\s+\d+((?:\s+\d+)*)\s+Peds",   
-            r"Peds\s+\d+.*?Bikes\s+\d+((?:\s+\d+)*)\s+PEDs", 
-        ]
+    def _get_peak_hour(self, periods, key):
+        return periods[key] if periods else None
+
+    def _get_peds_and_bikes_vol(self, peds_and_bikes_by_section, key):
+        return peds_and_bikes_by_section[key] if peds_and_bikes_by_section else None
+
+    def _get_veh_vol(self, sections, key):
 
         results = []
-        elements = {}
         
-        for pattern in patterns:
-            match = re.search(pattern, sections[1:][key], re.DOTALL)
+        for pattern in _VEH_VOL_RES:
+            match = pattern.search(sections[key])
             if match:
 
                 numbers = [int(num) for num in match.group(1).strip().split()]
@@ -654,69 +804,61 @@ class RecentTMCScraper(WebScraper):
             else:
                 results.append([]) 
                 
-        if results[1]:
-            if len(results[1]) > 4:
-                elements.update({
-                    'east' : results[1][-1], 
-                    'west' : results[1][0]
-                    })
-                
-            elif len(results[1]) == 4:
-                
-                if results[1][0] == results[1][1] and results[1][2] == results[1][3]:
-                    elements.update({
-                        'east' : results[1][-1], 
-                        'west' : results[1][0]
-                        })
-                else:
-                    decision = max(results[1])
-                    elements.update({
-                        'east' : decision if decision == results[1][-1] else None,
-                        'west' : decision if decision == results[1][0] else None
-                        })
-
-            elif len(results[1]) == 3:
-                decision = max(results[1])
-                elements.update({
-                    'east' : decision if decision == results[1][-1] else None,
-                    'west' : decision if decision == results[1][0] else None
-                    })
-                
-            elif len(results[1]) == 2:
-                elements.update({
-                    'east' : 'manual_check', 
-                    'west' : 'manual_check'
-                    })
-                
-            else:
-                pass
-            
-        elements.update({
-        'north' : results[0][0] if results[0] else None,
-        'south' : max(results[2]) if results[2] else None
-        })
+        east, west = _decide_east_west(results[1])
+        elements = {
+            'north' : results[0][0] if results[0] else None,
+            'east' : east,
+            'south' : max(results[2]) if results[2] else None,
+            'west' : west
+            }
         return elements
     
-def main():
+def _scrape_recent():
     # Setup for Recent Traffic Movement Counts (TMC)
-    recent_tmc_raw_data_directory = os.path.join('..','data','raw','recent_intersection-traffic-movement-counts.csv')
+    recent_tmc_raw_data_directory = RAW_DIR / 'recent_intersection-traffic-movement-counts.csv'
     recent_tmc = RecentTMCScraper(raw_directory= recent_tmc_raw_data_directory ,period_filters=['AM','MD','PM'])
     recent_tmc_links = recent_tmc.scrape_sub_urls()
-    recent_tmc_links.to_csv(os.path.join('..','data','scraped','recent_tmc_links.csv'),index=False)
+    if os.getenv('TMC_DUMP_LINKS'):
+        _write_csv(recent_tmc_links, SCRAPED_DIR / 'recent_tmc_links.csv')
+        _write_parquet(recent_tmc_links, SCRAPED_DIR / 'recent_tmc_links.parquet')
     recent_tmc_scraped = recent_tmc.scrape_tmc_counts(recent_tmc_links)
     recent_tmc_scraped.insert(1,'intersection',recent_tmc_links['Intersection'])
-    recent_tmc_scraped.to_csv(os.path.join('..','data','scraped','recent_tmc_scraped.csv'),index=False)
+    _write_csv(recent_tmc_scraped, SCRAPED_DIR / 'recent_tmc_scraped.csv')
+    _write_parquet(recent_tmc_scraped.astype({'intersection': 'category'}), SCRAPED_DIR / 'recent_tmc_scraped.parquet')
 
+def _scrape_old():
     # Setup for Old Traffic Movement Counts (TMC)
-    old_tmc_raw_data_directory = os.path.join('..','data','raw','old_intersection-traffic-movement-counts.csv')
-    old_tmc = OldTMCScraper(raw_directory= old_tmc_raw_data_directory ,period_filters=['AM','MD','PM'])
-    old_tmc_links = old_tmc.scrape_sub_urls()
-    old_tmc_links.to_csv(os.path.join('..','data','scraped','old_tmc_links.csv'),index=False)
+    old_tmc_raw_data_directory = RAW_DIR / 'old_intersection-traffic-movement-counts.csv'
+    with OldTMCScraper(raw_directory= old_tmc_raw_data_directory ,period_filters=['AM','MD','PM']) as old_tmc:
+        old_tmc_links = old_tmc.scrape_sub_urls()
+    if os.getenv('TMC_DUMP_LINKS'):
+        _write_csv(old_tmc_links, SCRAPED_DIR / 'old_tmc_links.csv')
+        _write_parquet(old_tmc_links, SCRAPED_DIR / 'old_tmc_links.parquet')
     old_tmc_scraped = old_tmc.scrape_tmc_counts(old_tmc_links)
-    old_tmc_scraped.insert(1,'intersection',old_tmc_links['INTERSECTION'])
-    old_tmc_scraped.insert(2,'longitude',old_tmc_links['Geom'].apply(lambda x: re.findall(r'-\d+.\d+',x.split()[1])[0]))
-    old_tmc_scraped.insert(3,'latitude',old_tmc_links['Geom'].apply(lambda x: re.findall(r'\d+.\d+',x.split()[2])[0]))
-    old_tmc_scraped.to_csv(os.path.join('..','data','scraped','old_tmc_scraped.csv'),index=False)
+    old_tmc_scraped = pd.concat([
+        old_tmc_scraped.iloc[:, :1],
+        old_tmc_links['INTERSECTION'].rename('intersection'),
+        _extract_coordinates(old_tmc_links['Geom']),
+        old_tmc_scraped.iloc[:, 1:]
+        ], axis=1)
+    _write_csv(old_tmc_scraped, SCRAPED_DIR / 'old_tmc_scraped.csv')
+    _write_parquet(old_tmc_scraped.astype({'intersection': 'category'}), SCRAPED_DIR / 'old_tmc_scraped.parquet')
+
+def main():
+    # Cache HTTP responses across runs; install before the scrapers create their sessions
+    requests_cache.install_cache(
+        CACHE_DIR / 'tmc_http',
+        backend='sqlite',
+        expire_after=24*3600,
+        allowable_methods=('GET',)
+        )
+    SCRAPED_DIR.mkdir(parents=True, exist_ok=True)
+
+    # The recent and old pipelines are independent and network-bound, so run them side by side
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pipelines = [executor.submit(_scrape_recent), executor.submit(_scrape_old)]
+        for pipeline in pipelines:
+            pipeline.result()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file